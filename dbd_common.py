@@ -0,0 +1,25 @@
+"""Site constants shared by the DBD scrapers; kept free of Playwright imports."""
+
+# Requests the financials parser never needs. Stylesheets are kept because the
+# selector heuristics rely on is_visible(), which depends on CSS.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Appears once a search has rendered either a detail page or a result list
+# (no bare "table": layout tables are on screen before the search has finished)
+RESULT_MARKERS = "#menu2, #menu22, #companyProfileTab22, mat-table, [role='table']"
+
+# Reduce automation fingerprints; shared by every context so they all look alike
+INIT_SCRIPT = """
+// Remove webdriver flag
+Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+// Mock plugins and languages
+Object.defineProperty(navigator, 'languages', { get: () => ['th-TH','en-US','en'] });
+Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3] });
+// Permissions query spoof
+const originalQuery = window.navigator.permissions && window.navigator.permissions.query;
+if (originalQuery) {
+  window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications' ? Promise.resolve({ state: Notification.permission }) : originalQuery(parameters)
+  );
+}
+""".strip()
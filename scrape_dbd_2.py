@@ -1,14 +1,24 @@
+import argparse
 import csv
 import asyncio
 import re
 import sys
 import logging
+from logging.handlers import RotatingFileHandler
 
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
-from playwright.sync_api import sync_playwright
-from playwright.sync_api import Page
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from urllib3.util.retry import Retry
+
+# Shared with the sync scraper so both drive the site the same way
+from dbd_common import BLOCKED_RESOURCE_TYPES, INIT_SCRIPT, RESULT_MARKERS
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
 
 juristic_ids = [
     "0105542065502"
@@ -16,30 +26,113 @@ juristic_ids = [
 
 output_file = "dbd_data.csv"
 
-logging.basicConfig(
-    filename="dbd_scraper.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# Maximum number of browser contexts scraping at once
+concurrency = 10
+
+# Handlers are attached by configure_logging() when run as a script, so importing
+# this module does not create log files
+logger = logging.getLogger("dbd_scraper")
 
 SEARCH_URL = "https://datawarehouse.dbd.go.th/searchJuristic"
+API_URL = "https://dataapi.moc.go.th/juristic"
+API_TIMEOUT = (3, 10)  # (connect, read) seconds
+
+# Common consent button labels (Thai + English)
+CONSENT_NAMES = [
+    "ยอมรับ",
+    "ยินยอม",
+    "ตกลง",
+    "รับทราบ",
+    "Accept",
+    "Agree",
+    "I agree",
+    "Accept all",
+]
+
+# Patterns used on every search, compiled once
+_TAB_RE = re.compile(r"เลข|ID|Registration|Tax", re.I)
+_SEARCH_BTN_RE = re.compile(r"ค้นหา|search", re.I)
+_LABEL_RE = re.compile(r"ค้นหา|นิติบุคคล|เลข|Juristic|Registration|Search", re.I)
+_CONSENT_RE = re.compile("|".join(map(re.escape, CONSENT_NAMES)), re.I)
+
+# Winning selector per (URL path, candidate list), so later IDs skip the probe
+_WINNING_SELECTORS: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+
+# Shared keep-alive HTTP session so repeated API lookups reuse pooled connections
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504],
+                      respect_retry_after_header=True),
+))
+
+
+def fetch_juristic_json(juristic_id: str) -> Optional[Dict[str, Any]]:
+    """Look up a juristic ID via the JSON API; returns None if the call fails."""
+    try:
+        response = session.get(API_URL, params={"juristic_id": juristic_id}, timeout=API_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"API lookup failed for juristic ID {juristic_id}: {e}")
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def api_row(juristic_id: str) -> Optional[Dict[str, str]]:
+    data = fetch_juristic_json(juristic_id)
+    if not data or not data.get("juristicName"):
+        return None
+    return {
+        "juristic_id": juristic_id,
+        "company_name": data.get("juristicName", ""),
+        "active_status": data.get("status", ""),
+    }
+
 
+def block_heavy_resources(route):
+    # Returns the abort/continue call so it works as both a sync and an async route handler
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return route.abort()
+    return route.continue_()
 
-def first_visible(page: Page, selectors: List[str], timeout_ms: int = 0):
-    for sel in selectors:
+
+def first_visible(page: "Page", selectors: List[str], timeout_ms: int = 0):
+    key = (urlsplit(page.url).path, tuple(selectors))
+    cached = _WINNING_SELECTORS.get(key)
+    if cached:
         try:
-            loc = page.locator(sel)
-            if timeout_ms:
-                loc.first.wait_for(state="visible", timeout=timeout_ms)
-            if loc.first.is_visible():
-                return loc.first
-        except PlaywrightTimeoutError:
-            continue
+            loc = page.locator(f"{cached} >> visible=true").first
+            if loc.is_visible():
+                return loc
         except Exception:
-            continue
-    return None
+            pass
+
+    # Let the browser evaluate the whole candidate list as one union query
+    loc = page.locator(f"{','.join(selectors)} >> visible=true").first
+    try:
+        if timeout_ms:
+            loc.wait_for(state="visible", timeout=timeout_ms)
+        elif not loc.is_visible():
+            return None
+    except Exception:
+        # Timeouts included
+        return None
 
-def try_click(page: Page, locators: List[Any], timeout_ms: int = 2000) -> bool:
+    # Remember which candidate matched for the next page with this URL
+    try:
+        index = loc.evaluate(
+            "(el, sels) => sels.findIndex(s => { try { return el.matches(s); } catch (e) { return false; } })",
+            selectors,
+        )
+        if index >= 0:
+            _WINNING_SELECTORS[key] = selectors[index]
+    except Exception:
+        pass
+    return loc
+
+def try_click(page: "Page", locators: List[Any], timeout_ms: int = 2000) -> bool:
     for loc in locators:
         try:
             if isinstance(loc, str):
@@ -54,8 +147,39 @@ def try_click(page: Page, locators: List[Any], timeout_ms: int = 2000) -> bool:
     return False
 
 
-def fill_search_and_submit(page: Page, juristic_id: str, verbose: bool = False):
-    # Attempt multiple selector strategies for the search input
+def fill_search_and_submit(page: "Page", juristic_id: str, verbose: bool = False):
+    search_input = find_search_input(page, verbose=verbose)
+
+    if verbose:
+        print("Typing juristic ID into search box...", file=sys.stderr)
+    search_input.fill(juristic_id)
+
+    # Try to submit: press Enter or click a search button
+    search_input.press("Enter")
+    # Also try click a button to be safe
+    # Prefer the main search icon/button near the #form
+    button_variants = [
+        '#searchicon, button[type="submit"], button[id*="search"]',
+        page.get_by_role("button", name=_SEARCH_BTN_RE),
+    ]
+    try_click(page, button_variants, timeout_ms=2000)
+    # Try pick first suggestion if an autocomplete list appears
+    try:
+        suggestion = page.get_by_text(juristic_id, exact=False).first
+        if suggestion.is_visible():
+            suggestion.click()
+    except Exception:
+        try:
+            page.locator("li[role='option']").first.click(timeout=1200)
+        except Exception:
+            pass
+
+
+def find_search_input(page: "Page", verbose: bool = False):
+    # Attempt multiple selector strategies for the search input. first_visible()
+    # unions these and takes the first match in document order, so generic catch-alls
+    # such as input[type="text"] would beat #key-word; the broad fallback below
+    # covers them instead.
     input_selectors = [
         '#key-word',
         'input[name="textSearch"]',
@@ -69,23 +193,21 @@ def fill_search_and_submit(page: Page, juristic_id: str, verbose: bool = False):
         'input[placeholder*="Registration" i]',
         'input[placeholder*="Tax" i]',
         'input[placeholder*="Search" i]',
-        'input[type="search"]',
-        'input[type="text"]',
     ]
 
     # If there are tabs for search modes, try switching to ID-based tab
     try_click(
         page,
         [
-            page.get_by_role("tab", name=re.compile("เลข|ID|Registration|Tax", re.I)),
-            page.get_by_role("button", name=re.compile("เลข|ID|Registration|Tax", re.I)),
+            page.get_by_role("tab", name=_TAB_RE),
+            page.get_by_role("button", name=_TAB_RE),
         ],
         timeout_ms=1200,
     )
 
     # Prefer accessible role by label if present
     try:
-        labeled = page.get_by_label(re.compile("ค้นหา|นิติบุคคล|เลข|Juristic|Registration|Search", re.I))
+        labeled = page.get_by_label(_LABEL_RE)
         if labeled.first.is_visible():
             search_input = labeled.first
         else:
@@ -119,199 +241,267 @@ def fill_search_and_submit(page: Page, juristic_id: str, verbose: bool = False):
             except Exception:
                 pass
         raise RuntimeError("Could not find search input on page")
+    return search_input
 
-    if verbose:
-        print("Typing juristic ID into search box...", file=sys.stderr)
-    search_input.fill(juristic_id)
 
-    # Try to submit: press Enter or click a search button
-    search_input.press("Enter")
-    # Also try click a button to be safe
-    # Prefer the main search icon/button near the #form
-    button_variants = [
-        '#searchicon',
-        page.get_by_role("button", name=re.compile("ค้นหา|search|Search", re.I)),
-        'button[type="submit"]',
-        'button[id*="search"]',
-    ]
-    try_click(page, button_variants, timeout_ms=2000)
-    # Try pick first suggestion if an autocomplete list appears
+def accept_cookies(page: "Page"):
+    # One role query matching any of the consent labels; only visible buttons count,
+    # so a hidden match cannot stand in for the one on screen
+    consent = page.get_by_role("button", name=_CONSENT_RE).locator("visible=true")
+    try_click(page, [consent], timeout_ms=1500)
+
+
+def launch_browser(p, headless: bool = False, slow_mo: int = 0):
+    # Try using system Chrome to reduce bot detection, fallback to bundled Chromium
     try:
-        suggestion = page.get_by_text(juristic_id, exact=False).first
-        if suggestion.is_visible():
-            suggestion.click()
+        return p.chromium.launch(channel="chrome", headless=headless, slow_mo=slow_mo,
+                                 args=["--disable-blink-features=AutomationControlled"])  # type: ignore
     except Exception:
-        try:
-            page.locator("li[role='option']").first.click(timeout=1200)
-        except Exception:
-            pass
+        return p.chromium.launch(headless=headless, slow_mo=slow_mo,
+                                 args=["--disable-blink-features=AutomationControlled"])  # type: ignore
 
 
-def accept_cookies(page: Page):
-    # Common consent patterns (Thai + English)
-    names = [
-        "ยอมรับ",
-        "ยินยอม",
-        "ตกลง",
-        "รับทราบ",
-        "Accept",
-        "Agree",
-        "I agree",
-        "Accept all",
-    ]
-    btns = [page.get_by_role("button", name=name) for name in names]
-    try_click(page, btns, timeout_ms=1500)
+def scrape(juristic_id: str, browser=None, headless: bool = False, slow_mo: int = 0,
+           verbose: bool = False) -> Dict[str, Any]:
+    """Scrape one juristic ID.
+
+    Pass an already-open ``browser`` to reuse it across IDs; only a fresh context is
+    created and closed per call. Without one, a browser is launched for this call.
+    """
+    if browser is not None:
+        return _scrape_in_browser(browser, juristic_id, verbose=verbose)
 
+    from playwright.sync_api import sync_playwright
 
-def scrape(juristic_id: str, headless: bool = False, slow_mo: int = 0, verbose: bool = False) -> Dict[str, Any]:
     with sync_playwright() as p:
-        # Try using system Chrome to reduce bot detection, fallback to bundled Chromium
-        browser = None
+        browser = launch_browser(p, headless=headless, slow_mo=slow_mo)
         try:
-            browser = p.chromium.launch(channel="chrome", headless=headless, slow_mo=slow_mo,
-                                        args=["--disable-blink-features=AutomationControlled"])  # type: ignore
-        except Exception:
-            browser = p.chromium.launch(headless=headless, slow_mo=slow_mo,
-                                        args=["--disable-blink-features=AutomationControlled"])  # type: ignore
+            return _scrape_in_browser(browser, juristic_id, verbose=verbose)
+        finally:
+            browser.close()
 
-        ua = (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/119.0.0.0 Safari/537.36"
-        )
-        context = browser.new_context(
-            locale="th-TH",
-            user_agent=ua,
-            viewport={"width": 1366, "height": 768},
-        )
-        # Reduce automation fingerprints
-        context.add_init_script(
-            """
-            // Remove webdriver flag
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-            // Mock plugins and languages
-            Object.defineProperty(navigator, 'languages', { get: () => ['th-TH','en-US','en'] });
-            Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3] });
-            // Permissions query spoof
-            const originalQuery = window.navigator.permissions && window.navigator.permissions.query;
-            if (originalQuery) {
-              window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ? Promise.resolve({ state: Notification.permission }) : originalQuery(parameters)
-              );
-            }
-            """
-        )
+
+def _new_context(browser):
+    ua = (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/119.0.0.0 Safari/537.36"
+    )
+    context = browser.new_context(
+        locale="th-TH",
+        user_agent=ua,
+        viewport={"width": 1366, "height": 768},
+    )
+    context.route("**/*", block_heavy_resources)
+    # Reduce automation fingerprints
+    context.add_init_script(INIT_SCRIPT)
+    return context
+
+
+def _open_search_page(page: "Page", verbose: bool = False):
+    if verbose:
+        print(f"Navigating to {SEARCH_URL} ...", file=sys.stderr)
+    page.goto(SEARCH_URL, wait_until="domcontentloaded")
+    accept_cookies(page)
+
+
+def _scrape_in_browser(browser, juristic_id: str, verbose: bool = False) -> Dict[str, Any]:
+    context = _new_context(browser)
+    try:
         page = context.new_page()
         page.set_default_timeout(15000)
+        _open_search_page(page, verbose=verbose)
+        return _search_and_parse(page, juristic_id, verbose=verbose)
+    finally:
+        context.close()
 
-        if verbose:
-            print(f"Navigating to {SEARCH_URL} ...", file=sys.stderr)
-        page.goto(SEARCH_URL, wait_until="domcontentloaded")
 
-        accept_cookies(page)
+def _search_and_parse(page: "Page", juristic_id: str, verbose: bool = False) -> Dict[str, Any]:
+    # Only the sync fallback path needs these (and the sync Playwright API they import)
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    from scrape_dbd_playwright import (
+        extract_details,
+        goto_financials_tab,
+        is_detail_page,
+        open_first_result,
+        parse_financials_table_detailed,
+        wait_for_results,
+    )
 
-        fill_search_and_submit(page, juristic_id, verbose=verbose)
+    fill_search_and_submit(page, juristic_id, verbose=verbose)
 
-        # Some searches navigate directly to a detail page
-        try:
-            page.wait_for_load_state("networkidle", timeout=8000)
-        except PlaywrightTimeoutError:
-            pass
-        if is_detail_page(page, juristic_id):
-            # On the detail page, go to financials and parse only the table
-            if goto_financials_tab(page, verbose=verbose):
-                table = parse_financials_table_detailed(page, verbose=verbose)
-                context.close()
-                browser.close()
-                return {"financials_table": table}
-            context.close()
-            browser.close()
-            raise RuntimeError("Could not open financials tab on detail page")
-
-        # Wait for results and open first detail page
-        result_locator = wait_for_results(page, juristic_id, verbose=verbose)
-        if not result_locator:
-            raise RuntimeError("Search results not found or page structure changed.")
-
-        opened = open_first_result(page, result_locator, verbose=verbose)
-        if not opened:
-            # Attempt to stay on results and parse the first visible card/table row
-            if verbose:
-                print("Could not open details; extracting from results page...", file=sys.stderr)
-            details = extract_details(page)
-            details["note"] = "Extracted from results page; detail click failed"
-            return details
-
-        # On the detail page, parse only the financials table
+    # Some searches navigate directly to a detail page; wait for either that or a
+    # result list rather than for the whole page to go network-idle
+    try:
+        page.wait_for_selector(RESULT_MARKERS, timeout=8000)
+    except PlaywrightTimeoutError:
+        pass
+    if is_detail_page(page, juristic_id):
+        # On the detail page, go to financials and parse only the table
         if goto_financials_tab(page, verbose=verbose):
             table = parse_financials_table_detailed(page, verbose=verbose)
-            context.close()
-            browser.close()
             return {"financials_table": table}
+        raise RuntimeError("Could not open financials tab on detail page")
 
-        context.close()
-        browser.close()
-        raise RuntimeError("Could not open financials tab after navigating to detail page")
+    # Wait for results and open first detail page
+    result_locator = wait_for_results(page, juristic_id, verbose=verbose)
+    if not result_locator:
+        raise RuntimeError("Search results not found or page structure changed.")
 
-async def scrape_dbd_data(playwright, juristic_id, max_retries=3):
-    for attempt in range(1, max_retries + 1):
-        try:
-            logging.info(f"Attempt {attempt}: Scraping data for juristic ID {juristic_id}")
-            browser = await playwright.chromium.launch(headless=False, slow_mo=100)
-            page = await browser.new_page()
-            await page.goto("https://datawarehouse.dbd.go.th/index", timeout=5000)
-            # Close pop-up if it appears
-            try:
-                await page.click("text=ปิด", timeout=5000)
-                logging.info("Pop-up closed successfully.")
-            except:
-                logging.info("No pop-up detected or already closed.")
-            
-            await page.wait_for_selector("#searchText", timeout=5000)
+    opened = open_first_result(page, result_locator, verbose=verbose)
+    if not opened:
+        # Attempt to stay on results and parse the first visible card/table row
+        if verbose:
+            print("Could not open details; extracting from results page...", file=sys.stderr)
+        details = extract_details(page)
+        details["note"] = "Extracted from results page; detail click failed"
+        return details
+
+    # On the detail page, parse only the financials table
+    if goto_financials_tab(page, verbose=verbose):
+        table = parse_financials_table_detailed(page, verbose=verbose)
+        return {"financials_table": table}
+
+    raise RuntimeError("Could not open financials tab after navigating to detail page")
+
+def _log_attempt(retry_state):
+    juristic_id = retry_state.args[1]
+    logger.info(f"Attempt {retry_state.attempt_number}: Scraping data for juristic ID {juristic_id}")
+
+def _log_retry(retry_state):
+    juristic_id = retry_state.args[1]
+    e = retry_state.outcome.exception()
+    logger.warning(f"Attempt {retry_state.attempt_number} failed for juristic ID {juristic_id}, "
+                    f"retrying in {retry_state.next_action.sleep:.1f}s: {e}")
+
+def _is_playwright_error(exc: BaseException) -> bool:
+    # Resolved on first use so importing this module does not load the async API
+    from playwright.async_api import Error as PlaywrightError
+    return isinstance(exc, PlaywrightError)
+
+# Playwright errors (timeouts included) are usually transient; back off with jitter
+# between attempts instead of hammering the site
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=1, max=15),
+    retry=retry_if_exception(_is_playwright_error),
+    before=_log_attempt,
+    before_sleep=_log_retry,
+    reraise=True,
+)
+async def _scrape_attempt(browser, juristic_id):
+    # Already loaded by main() by the time an attempt runs
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-            await page.fill("#searchText", juristic_id)
-            await page.click("#btnSearch")
-            await page.wait_for_selector(".table", timeout=5000)
+    # One isolated context per attempt; the browser itself is shared
+    context = await browser.new_context()
+    try:
+        await context.add_init_script(INIT_SCRIPT)
+        await context.route("**/*", block_heavy_resources)
+        page = await context.new_page()
+        page.set_default_navigation_timeout(3000)
+        page.set_default_timeout(5000)
+        # The SPA keeps loading scripts long after the search box exists, so a slow
+        # navigation is not fatal: proceed as soon as the input shows up
+        try:
+            await page.goto("https://datawarehouse.dbd.go.th/index", wait_until="domcontentloaded")
+        except PlaywrightTimeoutError:
+            pass
+        search_box = page.locator("#searchText, #key-word").first
+        await search_box.wait_for(state="visible", timeout=3000)
+        # Close pop-up if it appears
+        try:
+            await page.click("text=ปิด", timeout=5000)
+            logger.info("Pop-up closed successfully.")
+        except:
+            logger.info("No pop-up detected or already closed.")
 
-            try:
-                company_name = await page.inner_text("xpath=//table//tr[2]/td[2]")
-                active_status = await page.inner_text("xpath=//table//tr[2]/td[6]")
-            except Exception as e:
-                logging.error(f"Error extracting data for {juristic_id}: {e}")
-                company_name = "Not Found"
-                active_status = "Not Found"
+        await search_box.fill(juristic_id)
+        await page.click("#btnSearch")
+        await page.wait_for_selector(".table", timeout=5000)
 
-            await browser.close()
-            return {
-                "juristic_id": juristic_id,
-                "company_name": company_name,
-                "active_status": active_status
-            }
-
-        except PlaywrightTimeoutError as e:
-            logging.warning(f"Timeout on attempt {attempt} for juristic ID {juristic_id}: {e}")
+        try:
+            company_name = await page.inner_text("xpath=//table//tr[2]/td[2]")
+            active_status = await page.inner_text("xpath=//table//tr[2]/td[6]")
         except Exception as e:
-            logging.error(f"Unexpected error on attempt {attempt} for juristic ID {juristic_id}: {e}")
-
-    logging.error(f"Failed to scrape data for juristic ID {juristic_id} after {max_retries} attempts")
+            logger.error(f"Error extracting data for {juristic_id}: {e}")
+            company_name = "Not Found"
+            active_status = "Not Found"
+
+        return {
+            "juristic_id": juristic_id,
+            "company_name": company_name,
+            "active_status": active_status
+        }
+    finally:
+        await context.close()
+
+async def scrape_dbd_data(browser, juristic_id, max_retries=3):
+    try:
+        return await _scrape_attempt.retry_with(stop=stop_after_attempt(max_retries))(browser, juristic_id)
+    except Exception as e:
+        logger.error(f"Failed to scrape data for juristic ID {juristic_id}: {e}")
     return {
         "juristic_id": juristic_id,
         "company_name": "Error",
         "active_status": "Error"
     }
 
-async def main():
+async def worker(browser, sem, queue, juristic_id, force_browser=False):
+    async with sem:
+        data = None
+        if not force_browser:
+            data = await asyncio.to_thread(api_row, juristic_id)
+        if data is None:
+            data = await scrape_dbd_data(browser, juristic_id)
+    await queue.put(data)
+
+async def csv_writer(queue):
+    # Sole owner of the output file; rows are flushed as they arrive so a crash
+    # still leaves everything scraped so far on disk
+    with open(output_file, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=["juristic_id", "company_name", "active_status"])
+        writer.writeheader()
+        while True:
+            row = await queue.get()
+            if row is None:
+                break
+            writer.writerow(row)
+            file.flush()
+
+async def main(force_browser: bool = False):
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+    writer_task = asyncio.create_task(csv_writer(queue))
+    from playwright.async_api import async_playwright
+
     async with async_playwright() as playwright:
-        results = []
-        for juristic_id in juristic_ids:
-            data = await scrape_dbd_data(playwright, juristic_id)
-            results.append(data)
+        # Launch once and hand the same browser to every worker
+        browser = await playwright.chromium.launch(headless=False, slow_mo=100)
+        sem = asyncio.Semaphore(concurrency)
+        try:
+            await asyncio.gather(*(worker(browser, sem, queue, j, force_browser) for j in juristic_ids))
+        finally:
+            await browser.close()
+            await queue.put(None)
+            await writer_task
 
-        with open(output_file, mode="w", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=["juristic_id", "company_name", "active_status"])
-            writer.writeheader()
-            writer.writerows(results)
+def configure_logging(path: str = "dbd_scraper.log"):
+    # Rotate so long batches cannot grow the log without bound
+    handler = RotatingFileHandler(path, maxBytes=10_000_000, backupCount=3, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
 
-# Use this instead of asyncio.run() in interactive environments
 if __name__ == "__main__":
-    asyncio.get_event_loop().run_until_complete(main())
\ No newline at end of file
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Scrape DBD company name and status for juristic IDs")
+    parser.add_argument("--force-browser", action="store_true",
+                        help="Skip the JSON API and always scrape with Playwright")
+    args = parser.parse_args()
+    # uvloop is optional; fall back to the default event loop when it is unavailable
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main(force_browser=args.force_browser))
@@ -1,48 +1,191 @@
-import requests
+import asyncio
+import csv
+import json
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+
+import aiohttp
+import lxml.html
 import pandas as pd
-from bs4 import BeautifulSoup
+from lxml import etree
 
 # Input and output file paths
 input_csv = "input.csv"   # Replace with your input file name
 output_csv = "output.csv"
 
-# Read Juristic IDs from CSV
-df_input = pd.read_csv(input_csv)
-juristic_ids = df_input['Registered No.'].astype(str).tolist()
-
-# Base URL for scraping
-base_url = "https://datawarehouse.dbd.go.th/index"
-
-# Prepare list for results
-results = []
-
-for juristic_id in juristic_ids:
-    # Construct query URL (adjust if API or query params exist)
-    params = {'juristicId': juristic_id}  # Example parameter; verify actual site behavior
-    response = requests.get(base_url, params=params)
-
-    if response.status_code == 200:
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extract required fields (update selectors based on actual HTML structure)
-        juristic_name = soup.find('span', {'id': 'juristicName'}).get_text(strip=True) if soup.find('span', {'id': 'juristicName'}) else ''
-        status = soup.find('span', {'id': 'status'}).get_text(strip=True) if soup.find('span', {'id': 'status'}) else ''
-        industry_name = soup.find('span', {'id': 'industryName'}).get_text(strip=True) if soup.find('span', {'id': 'industryName'}) else ''
-        registered_capital = soup.find('span', {'id': 'registeredCapital'}).get_text(strip=True) if soup.find('span', {'id': 'registeredCapital'}) else ''
-        total_revenue = soup.find('span', {'id': 'totalRevenue'}).get_text(strip=True) if soup.find('span', {'id': 'totalRevenue'}) else ''
-
-        results.append({
-            'Registered No.': juristic_id,
-            'Juristic Person Name': juristic_name,
-            'Status': status,
-            'Industry Name': industry_name,
-            'Registered Capital (Baht)': registered_capital,
-            'Total Revenue (Baht)': total_revenue
-        })
-    else:
-        print(f"Failed to fetch data for ID: {juristic_id}")
-
-# Save results to CSV
-df_output = pd.DataFrame(results)
-df_output.to_csv(output_csv, index=False)
-print(f"Data saved to {output_csv}")
\ No newline at end of file
+# JSON API endpoint (the datawarehouse site is an SPA, so its HTML has no data)
+base_url = "https://dataapi.moc.go.th/juristic"
+
+# Maximum number of requests in flight at once
+concurrency = 50
+
+# Per-host connection cap, to stay polite to the API server
+limit_per_host = 50
+
+# Seconds allowed for each request end to end
+request_timeout = 10
+
+# Rows buffered before each write to the output CSV
+chunk_size = 500
+
+# Source field (JSON key / HTML span id) -> output column
+fields = {
+    'juristicName': 'Juristic Person Name',
+    'status': 'Status',
+    'industryName': 'Industry Name',
+    'registeredCapital': 'Registered Capital (Baht)',
+    'totalRevenue': 'Total Revenue (Baht)',
+}
+fieldnames = ['Registered No.'] + list(fields.values())
+
+# Compiled once; string() folds the text extraction into the query
+span_xpaths = {name: etree.XPath(f"string(//span[@id='{name}'])") for name in fields}
+
+
+def load_done_ids():
+    # IDs already written by an earlier run, so an interrupted scrape can resume
+    if not os.path.exists(output_csv) or os.path.getsize(output_csv) == 0:
+        return set()
+    try:
+        df_done = pd.read_csv(output_csv, usecols=['Registered No.'], dtype=str)
+    except (pd.errors.EmptyDataError, ValueError):
+        return set()
+    return set(df_done['Registered No.'].dropna())
+
+
+def make_connector():
+    options = {}
+    # aiodns is optional; without it aiohttp resolves names in a thread pool
+    try:
+        import aiodns  # noqa: F401
+        options['resolver'] = aiohttp.resolver.AsyncResolver()
+    except ImportError:
+        pass
+    return aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=600,
+        family=socket.AF_INET,
+        **options,
+    )
+
+
+def make_record(juristic_id, values):
+    # None when there is no juristic name: an unrecognised payload is a failure,
+    # not an empty row, so the ID is retried on the next run instead of resumed past
+    if not str(values['juristicName'] or '').strip():
+        return None
+
+    record = {'Registered No.': juristic_id}
+    for name, column in fields.items():
+        record[column] = values[name]
+    return record
+
+
+def parse_html_record(juristic_id, body):
+    # Not JSON: read the fields out of an HTML page
+    try:
+        tree = lxml.html.fromstring(body)
+        values = {name: xp(tree).strip() for name, xp in span_xpaths.items()}
+    except (etree.ParserError, ValueError):
+        values = {name: '' for name in fields}
+    return make_record(juristic_id, values)
+
+
+async def fetch(session, sem, juristic_id, bodies):
+    params = {'juristic_id': juristic_id}
+    async with sem:
+        try:
+            async with session.get(base_url, params=params) as response:
+                if response.status != 200:
+                    print(f"Failed to fetch data for ID: {juristic_id}")
+                    return
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Failed to fetch data for ID: {juristic_id} ({e})")
+            return
+    await bodies.put((juristic_id, body))
+
+
+async def parse_stage(bodies, rows, executor):
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await bodies.get()
+        if item is None:
+            break
+        juristic_id, body = item
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            # Small JSON bodies decode faster inline than the round trip to a worker
+            row = make_record(juristic_id, {name: data.get(name, '') for name in fields})
+        else:
+            # HTML parsing is CPU-bound, so it runs in worker processes while fetches continue
+            row = await loop.run_in_executor(executor, parse_html_record, juristic_id, body)
+        if row is None:
+            print(f"No juristic name in response for ID: {juristic_id}")
+            continue
+        await rows.put(row)
+
+
+async def write_stage(rows, append=False):
+    with open(output_csv, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if not append:
+            writer.writeheader()
+        chunk = []
+        while True:
+            row = await rows.get()
+            if row is None:
+                break
+            chunk.append(row)
+            # Write in chunks so the full result set is never held in memory
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                f.flush()
+                chunk.clear()
+        writer.writerows(chunk)
+
+
+async def main():
+    # Read Juristic IDs from CSV
+    df_input = pd.read_csv(input_csv, dtype={'Registered No.': str})
+    # Each ID only needs scraping once
+    juristic_ids = df_input['Registered No.'].dropna().str.strip().drop_duplicates().tolist()
+    done = load_done_ids()
+    juristic_ids = [j for j in juristic_ids if j not in done]
+
+    sem = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=request_timeout)
+    # Bounded queues between stages apply backpressure to whichever stage is ahead
+    bodies = asyncio.Queue(maxsize=concurrency * 2)
+    rows = asyncio.Queue(maxsize=chunk_size * 2)
+    parsers = os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=parsers) as executor:
+        writer_task = asyncio.create_task(write_stage(rows, append=bool(done)))
+        parse_tasks = [asyncio.create_task(parse_stage(bodies, rows, executor)) for _ in range(parsers)]
+
+        async with aiohttp.ClientSession(connector=make_connector(), timeout=timeout) as session:
+            await asyncio.gather(*(fetch(session, sem, j, bodies) for j in juristic_ids))
+
+        for _ in parse_tasks:
+            await bodies.put(None)
+        await asyncio.gather(*parse_tasks)
+        await rows.put(None)
+        await writer_task
+    print(f"Data saved to {output_csv}")
+
+
+if __name__ == "__main__":
+    # uvloop is optional; fall back to the default event loop when it is unavailable
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())
@@ -1,25 +1,47 @@
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Define the API endpoint
 url = "https://dataapi.moc.go.th/juristic"
 
-# Set the juristic_id parameter
-juristic_id = "0105542065502"  # Replace with your actual juristic ID
+# Juristic IDs to look up
+juristic_ids = [
+    "0105542065502",  # Replace with your actual juristic IDs
+]
 
-# Define the query parameters
-params = {
-    "juristic_id": juristic_id
-}
+# One JSON document per line, one line per juristic ID
+output_file = "juristic_data.ndjson"
 
-# Make a GET request to the API with the query parameter
-try:
-    response = requests.get(url, params=params)
-    response.raise_for_status()  # Raise an error for bad status codes
-    data = response.json()
+# Reuse one keep-alive connection pool for every lookup
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
 
-    print("API Response:")
-    print(json.dumps(data, indent=2, ensure_ascii=False))  # Pretty-print JSON with Thai characters if present
+with open(output_file, "ab") as out:
+    for juristic_id in juristic_ids:
+        # Define the query parameters
+        params = {
+            "juristic_id": juristic_id
+        }
 
-except requests.exceptions.RequestException as e:
-    print(f"Error calling API: {e}")
\ No newline at end of file
+        # Make a GET request to the API with the query parameter
+        try:
+            response = session.get(url, params=params, timeout=(3, 10))
+            response.raise_for_status()  # Raise an error for bad status codes
+            # Decode the raw bytes directly; skips requests' charset detection
+            data = orjson.loads(response.content)
+        except requests.exceptions.RequestException as e:
+            print(f"Error calling API for {juristic_id}: {e}")
+            continue
+        except orjson.JSONDecodeError as e:
+            print(f"Invalid JSON from API for {juristic_id}: {e}")
+            continue
+
+        out.write(orjson.dumps(data) + b"\n")
+
+print(f"Data saved to {output_file}")
@@ -1,21 +1,68 @@
 import argparse
+import datetime
 import json
 import os
+import queue
 import re
 import sys
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 
 from playwright.sync_api import Page
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 
+from dbd_common import BLOCKED_RESOURCE_TYPES, INIT_SCRIPT, RESULT_MARKERS
+
 SEARCH_URL = "https://datawarehouse.dbd.go.th/searchJuristic"
 OUTPUT_DIR = "data"
 
+# Cookies/consent/WAF tokens from a previous run, reused while fresh
+STATE_PATH = os.path.join(OUTPUT_DIR, ".dbd_state.json")
+STATE_MAX_AGE_S = 24 * 3600
+
+# Per call-site tag: how often each selector produced the text, so the likeliest
+# selector is tried first on later pages
+_SELECTOR_HITS: Dict[str, Dict[str, int]] = {}
+# Per page: selector -> resolved text (or None), cleared when the page is recycled
+_PAGE_TEXT_CACHE: "weakref.WeakKeyDictionary[Page, Dict[str, Optional[str]]]" = weakref.WeakKeyDictionary()
+
+# Batch workers share the state file and stdout
+_STATE_LOCK = threading.Lock()
+_OUTPUT_LOCK = threading.Lock()
+
+# Patterns compiled once at import rather than on every call
+_JURISTIC_RE = re.compile(r"\d{13}")
+_NUM_STRIP_RE = re.compile(r"[^0-9\.-]")
+_UNIT_RE = re.compile(r"หน่วย\s*[:：]\s*([^\n]+)")
+_UNIT_SPLIT_RE = re.compile(r"\s+(?=(?:20|25)\d{2})")
+_TAB_LABEL_RE = re.compile("เลข|ID|Registration|Tax", re.I)
+_SEARCH_LABEL_RE = re.compile("ค้นหา|นิติบุคคล|เลข|Juristic|Registration|Search", re.I)
+_SEARCH_BTN_RE = re.compile("ค้นหา|search|Search", re.I)
+_FIN_SECTION_RE = re.compile("ข้อมูลงบการเงิน")
+_FIN_TAB_RE = re.compile("งบการเงิน|Financial", re.I)
+_DETAIL_MARKER_RE = re.compile("ชื่อนิติบุคคล|เลขทะเบียนนิติบุคคล")
+
+# Anything that looks like a cookie/consent banner
+COOKIE_BANNER_SELECTOR = "[id*='cookie'], [class*='cookie'], [id*='consent'], [class*='consent']"
+
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+)
+
 
 def is_valid_juristic_id(value: str) -> bool:
-    return bool(re.fullmatch(r"\d{13}", value))
+    return bool(_JURISTIC_RE.fullmatch(value))
 
 
 def first_visible(page: Page, selectors: List[str], timeout_ms: int = 0):
@@ -48,7 +95,18 @@ def try_click(page: Page, locators: List[Any], timeout_ms: int = 2000) -> bool:
     return False
 
 
-def accept_cookies(page: Page):
+def accept_cookies(page: Page) -> bool:
+    """Click through a visible cookie/consent banner; returns True if one was accepted."""
+    # Cheap banner probe first: most visits (warm sessions especially) show none,
+    # and then the button sweep below is wasted work
+    try:
+        # Only visible matches count; a hidden settings dialog must not mask the banner
+        page.locator(f"{COOKIE_BANNER_SELECTOR} >> visible=true").first.wait_for(
+            state="visible", timeout=400)
+    except PlaywrightTimeoutError:
+        return False
+    except Exception:
+        pass
     # Common consent patterns (Thai + English)
     names = [
         "ยอมรับ",
@@ -61,47 +119,87 @@ def accept_cookies(page: Page):
         "Accept all",
     ]
     btns = [page.get_by_role("button", name=name) for name in names]
-    try_click(page, btns, timeout_ms=1500)
+    return try_click(page, btns, timeout_ms=1500)
+
+
+# Search input candidates, most specific first
+SEARCH_INPUT_SELECTORS = [
+    '#key-word',
+    'input[name="textSearch"]',
+    'form#form input.form-control',
+    'input[name="search"]',
+    'input[id*="search"]',
+    'input[placeholder*="ค้นหา"]',
+    'input[placeholder*="นิติบุคคล"]',
+    'input[placeholder*="เลข"]',
+    'input[placeholder*="Juristic" i]',
+    'input[placeholder*="Registration" i]',
+    'input[placeholder*="Tax" i]',
+    'input[placeholder*="Search" i]',
+    'input[type="search"]',
+    'input[type="text"]',
+]
+# Match any text box on the page, so they only count after the label lookup
+_GENERIC_INPUT_SELECTORS = ('input[type="search"]', 'input[type="text"]')
+_SPECIFIC_INPUT_SELECTORS = [sel for sel in SEARCH_INPUT_SELECTORS if sel not in _GENERIC_INPUT_SELECTORS]
+
+# Runs in the page: the first candidate selector whose element is rendered, or null
+_FIRST_VISIBLE_JS = r"""
+(cands) => {
+  for (const s of cands) {
+    let el = null;
+    try { el = document.querySelector(s); } catch (e) { continue; }
+    if (el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden') return s;
+  }
+  return null;
+}
+"""
+
+
+def on_search_page(page: Page) -> bool:
+    """True if the page still shows the search form, so the next ID can skip the reload."""
+    if page.url.split("#", 1)[0].split("?", 1)[0].rstrip("/") != SEARCH_URL:
+        return False
+    try:
+        return bool(page.evaluate(_FIRST_VISIBLE_JS, _SPECIFIC_INPUT_SELECTORS))
+    except Exception:
+        return False
 
 
 def fill_search_and_submit(page: Page, juristic_id: str, verbose: bool = False):
     # Attempt multiple selector strategies for the search input
-    input_selectors = [
-        '#key-word',
-        'input[name="textSearch"]',
-        'form#form input.form-control',
-        'input[name="search"]',
-        'input[id*="search"]',
-        'input[placeholder*="ค้นหา"]',
-        'input[placeholder*="นิติบุคคล"]',
-        'input[placeholder*="เลข"]',
-        'input[placeholder*="Juristic" i]',
-        'input[placeholder*="Registration" i]',
-        'input[placeholder*="Tax" i]',
-        'input[placeholder*="Search" i]',
-        'input[type="search"]',
-        'input[type="text"]',
-    ]
+    input_selectors = SEARCH_INPUT_SELECTORS
 
     # If there are tabs for search modes, try switching to ID-based tab
     try_click(
         page,
         [
-            page.get_by_role("tab", name=re.compile("เลข|ID|Registration|Tax", re.I)),
-            page.get_by_role("button", name=re.compile("เลข|ID|Registration|Tax", re.I)),
+            page.get_by_role("tab", name=_TAB_LABEL_RE),
+            page.get_by_role("button", name=_TAB_LABEL_RE),
         ],
         timeout_ms=1200,
     )
 
-    # Prefer accessible role by label if present
+    # Resolve the specific candidates in one round trip. The generic catch-alls are
+    # left to the serial fallback so the labelled input below still gets precedence.
+    search_input = None
     try:
-        labeled = page.get_by_label(re.compile("ค้นหา|นิติบุคคล|เลข|Juristic|Registration|Search", re.I))
-        if labeled.first.is_visible():
-            search_input = labeled.first
-        else:
-            search_input = first_visible(page, input_selectors, timeout_ms=5000)
+        resolved = page.evaluate(_FIRST_VISIBLE_JS, _SPECIFIC_INPUT_SELECTORS)
+        if resolved:
+            search_input = page.locator(resolved).first
     except Exception:
-        search_input = first_visible(page, input_selectors, timeout_ms=5000)
+        pass
+
+    # Prefer accessible role by label if present
+    if search_input is None:
+        try:
+            labeled = page.get_by_label(_SEARCH_LABEL_RE)
+            if labeled.first.is_visible():
+                search_input = labeled.first
+            else:
+                search_input = first_visible(page, input_selectors, timeout_ms=5000)
+        except Exception:
+            search_input = first_visible(page, input_selectors, timeout_ms=5000)
 
     # Broaden fallback: any visible text input
     if not search_input:
@@ -132,15 +230,15 @@ def fill_search_and_submit(page: Page, juristic_id: str, verbose: bool = False):
 
     if verbose:
         print("Typing juristic ID into search box...", file=sys.stderr)
-    search_input.fill(juristic_id)
+    search_input.fill(juristic_id, timeout=10000)
 
     # Try to submit: press Enter or click a search button
-    search_input.press("Enter")
+    search_input.press("Enter", timeout=10000)
     # Also try click a button to be safe
     # Prefer the main search icon/button near the #form
     button_variants = [
         '#searchicon',
-        page.get_by_role("button", name=re.compile("ค้นหา|search|Search", re.I)),
+        page.get_by_role("button", name=_SEARCH_BTN_RE),
         'button[type="submit"]',
         'button[id*="search"]',
     ]
@@ -169,24 +267,33 @@ def wait_for_results(page: Page, juristic_id: str, verbose: bool = False) -> Opt
         '[role="row"], .mat-row, tr',
     ]
 
-    # Wait for navigation or content change
+    # ID-specific matches get longer to show up than the generic fallbacks
+    specific = potential_results[:2]
+    # Race the ID-specific and result-container candidates in one wait instead of
+    # waiting for the page to go idle. Bare table/tr are left out: any layout table
+    # would end the race before the results render.
+    race_css = [
+        potential_results[1],
+        '[data-testid*="result" i]',
+        '.results, #results, [class*="result" i]',
+        'mat-table, .mat-table, [role="table"]',
+    ]
     try:
-        page.wait_for_load_state("networkidle", timeout=10000)
+        race = potential_results[0].or_(page.locator(f"{', '.join(race_css)} >> visible=true"))
+        race.first.wait_for(state="visible", timeout=10000)
     except PlaywrightTimeoutError:
         pass
 
-    for attempt in range(2):
-        for pr in potential_results:
-            try:
-                locator = page.locator(pr) if isinstance(pr, str) else pr
-                locator.first.wait_for(state="visible", timeout=3000)
-                if verbose:
-                    print(f"Found results via selector: {pr}", file=sys.stderr)
-                return locator
-            except Exception:
-                continue
-        # small wait and try again
-        time.sleep(1)
+    # Something has rendered (or nothing will); pick the most specific match
+    for pr in potential_results:
+        try:
+            locator = page.locator(pr) if isinstance(pr, str) else pr
+            locator.first.wait_for(state="visible", timeout=3000 if pr in specific else 1000)
+            if verbose:
+                print(f"Found results via selector: {pr}", file=sys.stderr)
+            return locator
+        except Exception:
+            continue
     # Debug aid on failure
     if verbose:
         try:
@@ -213,7 +320,7 @@ def open_first_result(page: Page, result_locator: Any, verbose: bool = False) ->
         if first_link.is_visible():
             if verbose:
                 print("Opening first result...", file=sys.stderr)
-            first_link.click()
+            first_link.click(timeout=10000)
             page.wait_for_load_state("domcontentloaded", timeout=10000)
             return True
     except Exception:
@@ -222,87 +329,158 @@ def open_first_result(page: Page, result_locator: Any, verbose: bool = False) ->
     try:
         row = page.locator('[role="row"], .mat-row, tr').first
         if row.is_visible():
-            row.click()
+            row.click(timeout=10000)
             page.wait_for_load_state("domcontentloaded", timeout=10000)
             return True
     except Exception:
         pass
     # As a final fallback, try clicking the locator itself
     try:
-        result_locator.first.click()
+        result_locator.first.click(timeout=10000)
         page.wait_for_load_state("domcontentloaded", timeout=10000)
         return True
     except Exception:
         return False
 
 
-def extract_text_candidates(page: Page, selectors: List[str]) -> Optional[str]:
-    for sel in selectors:
-        try:
-            loc = page.locator(sel)
-            if loc.first.is_visible():
-                text = loc.first.inner_text().strip()
-                if text:
-                    return text
-        except Exception:
-            continue
-    return None
+def _ordered_selectors(tag: Optional[str], selectors: List[str]) -> List[str]:
+    if not tag or tag not in _SELECTOR_HITS:
+        return selectors
+    hits = _SELECTOR_HITS[tag]
+    # sorted() is stable, so unseen selectors keep their declared order
+    return sorted(selectors, key=lambda sel: -hits.get(sel, 0))
 
 
-def extract_details(page: Page) -> Dict[str, Any]:
-    data: Dict[str, Any] = {
-        "url": page.url,
-        "title": None,
-        "name_th": None,
-        "name_en": None,
-        "status": None,
-        "address": None,
-        "registered_capital": None,
-        "directors": [],
-        "raw_text_sample": None,
-    }
+def extract_text_candidates(page: Page, selectors: List[str], tag: Optional[str] = None) -> Optional[str]:
+    memo = _PAGE_TEXT_CACHE.setdefault(page, {})
+    for sel in _ordered_selectors(tag, selectors):
+        if sel in memo:
+            text = memo[sel]
+        else:
+            text = None
+            try:
+                loc = page.locator(sel)
+                # Brief wait for late-rendering fields; absent ones time out fast
+                loc.first.wait_for(state="visible", timeout=300)
+                text = loc.first.inner_text().strip() or None
+            except Exception:
+                pass
+            memo[sel] = text
+        if text:
+            if tag:
+                hits = _SELECTOR_HITS.setdefault(tag, {})
+                hits[sel] = hits.get(sel, 0) + 1
+            return text
+    return None
 
+
+# Candidate selectors per detail field, in declared priority order
+DETAIL_FIELDS: Dict[str, List[str]] = {
     # Title / Name candidates
-    data["title"] = extract_text_candidates(page, [
+    "title": [
         "h1",
         "h2",
         '[data-testid*="title" i]',
         '[data-testid*="name" i]',
-    ])
-
+    ],
     # Name TH and EN heuristics
-    name_th = extract_text_candidates(page, [
+    "name_th": [
         'xpath=//*[contains(text(),"ชื่อ") and contains(text(),"ไทย")]/following::*[1]',
         'xpath=//*[contains(text(),"ชื่อนิติบุคคล")]/following::*[1]',
-    ])
-    name_en = extract_text_candidates(page, [
+    ],
+    "name_en": [
         'xpath=//*[contains(text(),"ชื่อ") and contains(text(),"อังกฤษ")]/following::*[1]',
         'xpath=//*[contains(text(),"Name") and contains(text(),"(English")]/following::*[1]',
-    ])
-    data["name_th"] = name_th
-    data["name_en"] = name_en
-
-    # Status
-    data["status"] = extract_text_candidates(page, [
+    ],
+    "status": [
         'xpath=//*[contains(text(),"สถานะ")]/following::*[1]',
         'xpath=//*[contains(text(),"Status")]/following::*[1]',
-    ])
-
-    # Address
-    data["address"] = extract_text_candidates(page, [
+    ],
+    "address": [
         'xpath=//*[contains(text(),"ที่ตั้ง") or contains(text(),"ที่อยู่")]/following::*[1]',
         'xpath=//*[contains(text(),"Address")]/following::*[1]',
-    ])
-
-    # Registered capital
-    data["registered_capital"] = extract_text_candidates(page, [
+    ],
+    "registered_capital": [
         'xpath=//*[contains(text(),"ทุน") and contains(text(),"จดทะเบียน")]/following::*[1]',
         'xpath=//*[contains(text(),"Registered") and contains(text(),"capital")]/following::*[1]',
-    ])
+    ],
+}
+# Directors list heuristic: look for a list under "กรรมการ"
+DIRECTORS_SELECTOR = 'xpath=//*[contains(text(),"กรรมการ")]/following::*[1]'
+
+# Runs in the page. For each field returns [text, selector] for the first selector
+# that resolves to visible, non-empty text, plus the directors list and page text.
+_DETAILS_JS = r"""
+({fields, directors}) => {
+  const isVisible = (el) => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+  const find = (sel) => {
+    if (sel.startsWith('xpath=')) {
+      return document.evaluate(sel.slice(6), document, null,
+                               XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    try { return document.querySelector(sel); } catch (e) { return null; }
+  };
+  const out = {};
+  for (const [key, selectors] of fields) {
+    out[key] = null;
+    for (const sel of selectors) {
+      const el = find(sel);
+      const text = el && isVisible(el) ? (el.innerText || '').trim() : '';
+      if (text) { out[key] = [text, sel]; break; }
+    }
+  }
+  let names = [];
+  const section = find(directors);
+  if (section && isVisible(section)) {
+    names = [...section.querySelectorAll('li, p, div')]
+      .map(n => (n.textContent || '').trim()).filter(Boolean).slice(0, 20);
+  }
+  const main = document.querySelector('main') || document.body;
+  return { fields: out, directors: names, text: main ? main.innerText : null };
+}
+"""
+
+
+def extract_details(page: Page) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "url": page.url,
+        "title": None,
+        "name_th": None,
+        "name_en": None,
+        "status": None,
+        "address": None,
+        "registered_capital": None,
+        "directors": [],
+        "raw_text_sample": None,
+    }
 
-    # Directors list heuristic: look for a list under "กรรมการ"
+    # One DOM walk in the page instead of a round-trip per selector
     try:
-        directors_section = page.locator('xpath=//*[contains(text(),"กรรมการ")]/following::*[1]')
+        specs = [[key, _ordered_selectors(key, sels)] for key, sels in DETAIL_FIELDS.items()]
+        found = page.evaluate(_DETAILS_JS, {"fields": specs, "directors": DIRECTORS_SELECTOR})
+    except Exception:
+        return _extract_details_by_locator(page, data)
+
+    for key, hit in found["fields"].items():
+        if hit:
+            text, sel = hit
+            data[key] = text
+            hits = _SELECTOR_HITS.setdefault(key, {})
+            hits[sel] = hits.get(sel, 0) + 1
+    data["directors"] = found["directors"]
+    body_text = found["text"]
+    if body_text:
+        data["raw_text_sample"] = " ".join(body_text.split())[:4000]
+    return data
+
+
+def _extract_details_by_locator(page: Page, data: Dict[str, Any]) -> Dict[str, Any]:
+    # Per-selector fallback, used when the in-page walk cannot run
+    for key, selectors in DETAIL_FIELDS.items():
+        data[key] = extract_text_candidates(page, selectors, tag=key)
+
+    try:
+        directors_section = page.locator(DIRECTORS_SELECTOR)
         if directors_section.first.is_visible():
             names = directors_section.first.locator('li, p, div').all_text_contents()
             cleaned = [n.strip() for n in names if n.strip()]
@@ -331,18 +509,15 @@ def goto_financials_tab(page: Page, verbose: bool = False) -> bool:
         if verbose:
             print("Opening financials tab...", file=sys.stderr)
         # Open parent financial section tab first, then the subtab
-        try_click(page, ['#menu2', page.get_by_text(re.compile('ข้อมูลงบการเงิน'))], timeout_ms=1500)
+        try_click(page, ['#menu2', page.get_by_text(_FIN_SECTION_RE)], timeout_ms=1500)
         # Prefer explicit subtab id
         if not try_click(page, ['#menu22'], timeout_ms=2000):
             try_click(page, [
-                page.get_by_role("link", name=re.compile("งบการเงิน|Financial", re.I)),
-                page.get_by_text(re.compile("งบการเงิน|Financial", re.I)),
+                page.get_by_role("link", name=_FIN_TAB_RE),
+                page.get_by_text(_FIN_TAB_RE),
             ], timeout_ms=2500)
-        try:
-            page.wait_for_load_state("networkidle", timeout=10000)
-        except PlaywrightTimeoutError:
-            pass
-        # Wait for AJAX-loaded content to appear
+        # Wait for AJAX-loaded content to appear; the container and table waits below
+        # wake as soon as the tab has rendered, instead of waiting for the network
         container = page.locator('#companyProfileTab22, .tab22')
         container.wait_for(state="visible", timeout=15000)
         # Wait until the container has content/text
@@ -350,11 +525,12 @@ def goto_financials_tab(page: Page, verbose: bool = False) -> bool:
             page.wait_for_function("el => el && el.innerText && el.innerText.length > 50", arg=container, timeout=15000)
         except Exception:
             pass
-        # Wait until a table renders
-        for _ in range(30):
-            if container.locator('table').count() > 0 and container.locator('table').first.is_visible():
-                return True
-            time.sleep(0.5)
+        # Wait until a table renders; wakes as soon as it is visible
+        try:
+            container.locator('table').first.wait_for(state="visible", timeout=15000)
+            return True
+        except PlaywrightTimeoutError:
+            pass
         # Debug dump if tables not found
         try:
             with open("debug_financials_tab.html", "w", encoding="utf-8") as f:
@@ -367,6 +543,37 @@ def goto_financials_tab(page: Page, verbose: bool = False) -> bool:
         return False
 
 
+FINANCIALS_CONTAINER = '#companyProfileTab22, .tab22'
+
+# Runs in the page. Identifies the visible table whose header has years plus the
+# "จำนวนเงิน" / "%เปลี่ยนแปลง" subheaders and returns its trimmed cell text, along
+# with the container text used to find the unit.
+_FINANCIALS_TABLE_JS = r"""
+(containerSelector) => {
+  const containers = [...document.querySelectorAll(containerSelector)];
+  if (!containers.length) return null;
+  const text = containers[0].innerText || '';
+  const cellTexts = (row) => [...row.querySelectorAll('th,td')].map(c => (c.textContent || '').trim());
+  const isVisible = (el) => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+  for (const container of containers) {
+    for (const t of container.querySelectorAll('table')) {
+      if (!isVisible(t)) continue;
+      const head = [...t.querySelectorAll('thead tr')].map(cellTexts);
+      const hasSub = head.some(r => {
+        const h = r.join(' ');
+        return h.includes('จำนวนเงิน') && h.includes('%เปลี่ยนแปลง');
+      });
+      const years = head.flat().filter(c => /^(20\d{2}|25\d{2})$/.test(c));
+      if (!hasSub || !years.length) continue;
+      const rows = [...t.querySelectorAll('tbody tr')].map(cellTexts);
+      return { text, years, rows };
+    }
+  }
+  return { text, years: [], rows: [] };
+}
+"""
+
+
 def _clean_number(text: str) -> Optional[float]:
     if text is None:
         return None
@@ -379,7 +586,7 @@ def _clean_number(text: str) -> Optional[float]:
         neg = True
         s = s[1:-1]
     # Remove non-numeric except dot and minus
-    s = re.sub(r"[^0-9\.-]", "", s)
+    s = _NUM_STRIP_RE.sub("", s)
     if s in ("", "-", "."):
         return None
     try:
@@ -402,152 +609,286 @@ def parse_financials_table_detailed(page: Page, verbose: bool = False) -> Dict[s
     }
     If the expected table isn't found, returns an empty structure.
     """
-    container = page.locator('#companyProfileTab22, .tab22')
-    tables = container.locator('table').all()
-
-    # Helper to find unit (e.g., "หน่วย : บาท") within the container vicinity
-    unit = None
+    # One round-trip: the browser finds the table and returns its raw cell text
     try:
-        text_block = container.inner_text()
-        m = re.search(r"หน่วย\s*[:：]\s*([^\n]+)", text_block)
-        if m:
-            unit_raw = m.group(1).strip()
-            # Remove trailing year tokens accidentally captured
-            unit = re.split(r"\s+(?=(?:20|25)\d{2})", unit_raw)[0].strip()
+        extracted = page.evaluate(_FINANCIALS_TABLE_JS, FINANCIALS_CONTAINER)
     except Exception:
-        pass
+        extracted = None
+    if not extracted:
+        return {"unit": None, "years": [], "rows": []}
 
-    target_table = None
-    years: List[str] = []
-    # Identify the table by header containing years and subheaders "จำนวนเงิน" and "%เปลี่ยนแปลง"
-    for t in tables:
-        try:
-            if not t.is_visible():
-                continue
-            thead_rows = t.locator('thead tr').all()
-            headers_txt = [" ".join(r.locator('th,td').all_text_contents()) for r in thead_rows]
-            has_sub = any('จำนวนเงิน' in h and '%เปลี่ยนแปลง' in h for h in headers_txt)
-            # Extract years that look like 25xx or 20xx
-            yrs = []
-            for r in thead_rows:
-                cells = [c.strip() for c in r.locator('th,td').all_text_contents()]
-                for c in cells:
-                    if re.search(r"^(20\d{2}|25\d{2})$", c):
-                        yrs.append(c)
-            if has_sub and yrs:
-                target_table = t
-                years = yrs
-                break
-        except Exception:
-            continue
-
-    if not target_table or not years:
+    # Helper to find unit (e.g., "หน่วย : บาท") within the container vicinity
+    unit = None
+    m = _UNIT_RE.search(extracted.get("text") or "")
+    if m:
+        unit_raw = m.group(1).strip()
+        # Remove trailing year tokens accidentally captured
+        unit = _UNIT_SPLIT_RE.split(unit_raw)[0].strip()
+
+    years: List[str] = extracted.get("years") or []
+    if not years:
         return {"unit": unit, "years": [], "rows": []}
 
     # Parse body rows; each row has label + for each year: amount, pct
+    return {"unit": unit, "years": years, "rows": _rows_from_cells(years, extracted["rows"])}
+
+
+def _rows_from_cells(years: List[str], cell_rows: List[List[str]]) -> List[Dict[str, Any]]:
+    """Pair up ``[label, amount, pct, amount, pct, ...]`` cell rows into per-year entries."""
     rows_out: List[Dict[str, Any]] = []
-    body_rows = target_table.locator('tbody tr').all()
-    for r in body_rows:
-        try:
-            cells = [c.strip() for c in r.locator('th,td').all_text_contents()]
-            if len(cells) < 1 + 2 * len(years):
-                # Skip subtotal separators or malformed
-                continue
-            label = cells[0]
-            entry: Dict[str, Any] = {"label": label}
-            # Iterate pairs for each year
-            idx = 1
-            for y in years:
-                amount_txt = cells[idx] if idx < len(cells) else ''
-                pct_txt = cells[idx + 1] if (idx + 1) < len(cells) else ''
-                amount = _clean_number(amount_txt)
-                pct = _clean_number(pct_txt)
-                entry[y] = {"amount": amount, "pct_change": pct}
-                idx += 2
-            rows_out.append(entry)
-        except Exception:
+    for cells in cell_rows:
+        if len(cells) < 1 + 2 * len(years):
+            # Skip subtotal separators or malformed
             continue
-
-    return {"unit": unit, "years": years, "rows": rows_out}
+        label = cells[0]
+        entry: Dict[str, Any] = {"label": label}
+        # Iterate pairs for each year
+        idx = 1
+        for y in years:
+            amount_txt = cells[idx] if idx < len(cells) else ''
+            pct_txt = cells[idx + 1] if (idx + 1) < len(cells) else ''
+            amount = _clean_number(amount_txt)
+            pct = _clean_number(pct_txt)
+            entry[y] = {"amount": amount, "pct_change": pct}
+            idx += 2
+        rows_out.append(entry)
+    return rows_out
 
 
 def is_detail_page(page: Page, juristic_id: str) -> bool:
+    # One in-page scan of the rendered text instead of two accessibility-tree searches
     try:
-        if page.get_by_text(juristic_id, exact=False).first.is_visible():
-            return True
+        return bool(page.evaluate(
+            "([id, marker]) => { const t = document.body ? document.body.innerText : '';"
+            " return t.includes(id) || new RegExp(marker).test(t); }",
+            [juristic_id, _DETAIL_MARKER_RE.pattern],
+        ))
     except Exception:
-        pass
+        return False
+
+
+def _log_xhr(response) -> None:
+    if response.request.resource_type in ("xhr", "fetch"):
+        print(f"XHR {response.status} {response.url}", file=sys.stderr)
+
+
+def _is_tracker(url: str) -> bool:
+    host = urlsplit(url).hostname or ""
+    return any(host == h or host.endswith("." + h) for h in TRACKER_HOSTS)
+
+
+def _route_filter(route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_tracker(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _launch_browser(p, headless: bool = False, slow_mo: int = 0):
+    # Try using system Chrome to reduce bot detection, fallback to bundled Chromium
     try:
-        if page.get_by_text(re.compile("ชื่อนิติบุคคล|เลขทะเบียนนิติบุคคล")).first.is_visible():
-            return True
+        return p.chromium.launch(channel="chrome", headless=headless, slow_mo=slow_mo,
+                                 args=["--disable-blink-features=AutomationControlled"])  # type: ignore
     except Exception:
-        pass
-    return False
+        return p.chromium.launch(headless=headless, slow_mo=slow_mo,
+                                 args=["--disable-blink-features=AutomationControlled"])  # type: ignore
 
 
-def scrape(juristic_id: str, headless: bool = False, slow_mo: int = 0, verbose: bool = False) -> Dict[str, Any]:
-    with sync_playwright() as p:
-        # Try using system Chrome to reduce bot detection, fallback to bundled Chromium
-        browser = None
+def _fresh_storage_state() -> Optional[str]:
+    """Return STATE_PATH if it is recent and holds cookies for the DBD site.
+
+    The file is only written after a consent banner was accepted, so a fresh one
+    means consent cookies are in it.
+    """
+    try:
+        if time.time() - os.path.getmtime(STATE_PATH) >= STATE_MAX_AGE_S:
+            return None
+        with open(STATE_PATH, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    cookies = (state.get("cookies") or []) if isinstance(state, dict) else []
+    if not any("dbd.go.th" in (c.get("domain") or "") for c in cookies):
+        return None
+    return STATE_PATH
+
+
+def _new_context(browser, storage_state: Optional[str] = None):
+    ua = (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/119.0.0.0 Safari/537.36"
+    )
+    context = browser.new_context(
+        locale="th-TH",
+        user_agent=ua,
+        viewport={"width": 1366, "height": 768},
+        storage_state=storage_state,
+    )
+    # Skip images, fonts, media and analytics; documents, scripts and XHRs still load
+    context.route("**/*", _route_filter)
+    # Reduce automation fingerprints
+    context.add_init_script(INIT_SCRIPT)
+    return context
+
+
+@contextmanager
+def running_playwright():
+    playwright = sync_playwright().start()
+    try:
+        yield playwright
+    finally:
+        playwright.stop()
+
+
+@contextmanager
+def closing_browser(playwright, headless: bool = False, slow_mo: int = 0):
+    browser = _launch_browser(playwright, headless=headless, slow_mo=slow_mo)
+    try:
+        yield browser
+    finally:
+        browser.close()
+
+
+@contextmanager
+def closing_context(browser, storage_state: Optional[str] = None):
+    context = _new_context(browser, storage_state=storage_state)
+    try:
+        yield context
+    finally:
+        context.close()
+
+
+class BrowserSession:
+    """A browser and context launched once and reused for many juristic IDs.
+
+    Pages are created up front and handed out with ``acquire_page``/``release_page``.
+    Sync Playwright objects are bound to the thread that created them, so use one
+    session per thread.
+    """
+
+    def __init__(self, headless: bool = False, slow_mo: int = 0, pool_size: int = 1,
+                 verbose: bool = False):
+        self.verbose = verbose
+        # Set once the context can no longer make pages (browser crashed or closed)
+        self.broken = False
+        # Each resource is registered as soon as it exists, so a failure partway
+        # through setup still unwinds whatever was already started
+        self._stack = ExitStack()
+        try:
+            playwright = self._stack.enter_context(running_playwright())
+            self.browser = self._stack.enter_context(
+                closing_browser(playwright, headless=headless, slow_mo=slow_mo)
+            )
+            state = _fresh_storage_state()
+            # A warm session already carries the consent cookies, so the banner is skipped
+            self.warm = state is not None
+            if verbose and self.warm:
+                print(f"Reusing browser state from {STATE_PATH}", file=sys.stderr)
+            self.context = self._stack.enter_context(closing_context(self.browser, storage_state=state))
+            # None is a sentinel meaning "session broken", so waiters never block forever
+            self._pages: "queue.Queue[Optional[Page]]" = queue.Queue()
+            for _ in range(max(1, pool_size)):
+                self._pages.put(self._new_page())
+        except BaseException:
+            self._stack.close()
+            raise
+
+    def _new_page(self) -> Page:
+        page = self.context.new_page()
+        # Short default so failed selector probes give up quickly; calls that need
+        # longer (navigation, clicks that load pages, the financials wait) say so
+        page.set_default_timeout(2000)
+        if self.verbose:
+            # Surface the data endpoints the SPA calls, to locate the financials XHR
+            page.on("response", _log_xhr)
+        return page
+
+    def save_storage_state(self) -> None:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        with _STATE_LOCK:
+            self.context.storage_state(path=STATE_PATH)
+        self.warm = True
+
+    def acquire_page(self) -> Page:
+        page = self._pages.get()
+        if page is None:
+            # Pass the sentinel on so every other waiter fails fast too
+            self._pages.put(None)
+            raise RuntimeError("Browser session is broken; the browser or context has closed")
+        return page
+
+    def release_page(self, page: Page, reset: bool = False) -> None:
+        _PAGE_TEXT_CACHE.pop(page, None)
+        # Keep a page that finished its ID as is, so a search form left open serves
+        # the next ID without a reload
+        if not reset and not page.is_closed():
+            self._pages.put(page)
+            return
+        # Blank a failed page so the next ID starts clean; replace it if it has died
         try:
-            browser = p.chromium.launch(channel="chrome", headless=headless, slow_mo=slow_mo,
-                                        args=["--disable-blink-features=AutomationControlled"])  # type: ignore
+            page.goto("about:blank")
         except Exception:
-            browser = p.chromium.launch(headless=headless, slow_mo=slow_mo,
-                                        args=["--disable-blink-features=AutomationControlled"])  # type: ignore
-
-        ua = (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/119.0.0.0 Safari/537.36"
-        )
-        context = browser.new_context(
-            locale="th-TH",
-            user_agent=ua,
-            viewport={"width": 1366, "height": 768},
-        )
-        # Reduce automation fingerprints
-        context.add_init_script(
-            """
-            // Remove webdriver flag
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-            // Mock plugins and languages
-            Object.defineProperty(navigator, 'languages', { get: () => ['th-TH','en-US','en'] });
-            Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3] });
-            // Permissions query spoof
-            const originalQuery = window.navigator.permissions && window.navigator.permissions.query;
-            if (originalQuery) {
-              window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ? Promise.resolve({ state: Notification.permission }) : originalQuery(parameters)
-              );
-            }
-            """
-        )
-        page = context.new_page()
-        page.set_default_timeout(15000)
+            try:
+                page.close()
+            except Exception:
+                pass
+            try:
+                page = self._new_page()
+            except Exception:
+                # The context itself is gone; no page can be handed out again
+                self.broken = True
+                self._pages.put(None)
+                return
+        self._pages.put(page)
 
-        if verbose:
-            print(f"Navigating to {SEARCH_URL} ...", file=sys.stderr)
-        page.goto(SEARCH_URL, wait_until="domcontentloaded")
+    def close(self) -> None:
+        # Context, then browser, then the driver; each step runs even if one before it
+        # raises, and a second call is a no-op
+        self._stack.close()
+
+    def __enter__(self) -> "BrowserSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
-        accept_cookies(page)
+
+def scrape_one(session: BrowserSession, juristic_id: str, verbose: bool = False) -> Dict[str, Any]:
+    page = session.acquire_page()
+    failed = False
+    try:
+        if on_search_page(page):
+            # The previous ID left the search form up; type straight into it
+            if verbose:
+                print("Reusing the open search page ...", file=sys.stderr)
+        else:
+            if verbose:
+                print(f"Navigating to {SEARCH_URL} ...", file=sys.stderr)
+            page.goto(SEARCH_URL, wait_until="domcontentloaded", timeout=30000)
+
+        # Persist state only once consent was actually given; WAF/session cookies
+        # alone say nothing about the banner, so until then keep probing for it
+        if not session.warm and accept_cookies(page):
+            try:
+                session.save_storage_state()
+            except Exception:
+                pass
 
         fill_search_and_submit(page, juristic_id, verbose=verbose)
 
-        # Some searches navigate directly to a detail page
+        # Some searches navigate directly to a detail page; wait for either that or a
+        # result list rather than for the whole page to go network-idle
         try:
-            page.wait_for_load_state("networkidle", timeout=8000)
+            page.wait_for_selector(RESULT_MARKERS, timeout=8000)
         except PlaywrightTimeoutError:
             pass
         if is_detail_page(page, juristic_id):
             # On the detail page, go to financials and parse only the table
             if goto_financials_tab(page, verbose=verbose):
                 table = parse_financials_table_detailed(page, verbose=verbose)
-                context.close()
-                browser.close()
                 return {"financials_table": table}
-            context.close()
-            browser.close()
             raise RuntimeError("Could not open financials tab on detail page")
 
         # Wait for results and open first detail page
@@ -567,62 +908,154 @@ def scrape(juristic_id: str, headless: bool = False, slow_mo: int = 0, verbose:
         # On the detail page, parse only the financials table
         if goto_financials_tab(page, verbose=verbose):
             table = parse_financials_table_detailed(page, verbose=verbose)
-            context.close()
-            browser.close()
             return {"financials_table": table}
 
-        context.close()
-        browser.close()
         raise RuntimeError("Could not open financials tab after navigating to detail page")
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        session.release_page(page, reset=failed)
+
+
+def scrape(juristic_id: str, headless: bool = False, slow_mo: int = 0, verbose: bool = False) -> Dict[str, Any]:
+    with BrowserSession(headless=headless, slow_mo=slow_mo, verbose=verbose) as session:
+        return scrape_one(session, juristic_id, verbose=verbose)
+
+
+def _write_output(juristic_id: str, data: Dict[str, Any]) -> str:
+    # Always output the detailed financials table JSON by default
+    output_data = data.get("financials_table", {"unit": None, "years": [], "rows": []})
+    output = json.dumps(output_data, ensure_ascii=False, indent=2)
+
+    # Ensure output directory exists and write file named by juristic id
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    out_path = _output_path(juristic_id)
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(output)
+
+    # Sidecar recording when this result was scraped
+    meta = {
+        "juristic_id": juristic_id,
+        "scraped_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+    with open(os.path.join(OUTPUT_DIR, f"{juristic_id}.meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return out_path
+
+
+def _output_path(juristic_id: str) -> str:
+    return os.path.join(OUTPUT_DIR, f"{juristic_id}.json")
+
+
+def _cached_output(juristic_id: str, ttl_s: float) -> Optional[str]:
+    """Return the existing output path if it was written less than ``ttl_s`` ago.
+
+    Only a table with years counts; the empty structure written when the table was
+    missing is a failed scrape and is retried.
+    """
+    out_path = _output_path(juristic_id)
+    try:
+        if time.time() - os.path.getmtime(out_path) >= ttl_s:
+            return None
+        with open(out_path, encoding="utf-8") as f:
+            table = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(table, dict) or not table.get("years"):
+        return None
+    return out_path
+
+
+def _batch_worker(pending: "queue.Queue[str]", args: argparse.Namespace, failures: List[str]) -> None:
+    """Drain ``pending`` with one BrowserSession owned by this thread.
+
+    The session is created on first use and closed on the same thread, as sync
+    Playwright requires; its browser launch is amortised over every ID it handles.
+    """
+    session: Optional[BrowserSession] = None
+    try:
+        while True:
+            try:
+                juristic_id = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if session is None:
+                    # Default to headful unless explicitly requested headless
+                    session = BrowserSession(headless=args.headless, slow_mo=args.slow,
+                                             verbose=args.verbose)
+                data = scrape_one(session, juristic_id, verbose=args.verbose)
+                out_path = _write_output(juristic_id, data)
+            except Exception as e:
+                if session is not None and session.broken:
+                    # Drop the dead browser; the next ID launches a fresh session
+                    try:
+                        session.close()
+                    except Exception:
+                        pass
+                    session = None
+                with _OUTPUT_LOCK:
+                    failures.append(juristic_id)
+                    print(json.dumps({
+                        "juristic_id": juristic_id,
+                        "error": str(e),
+                    }, ensure_ascii=False, indent=2))
+                continue
+            # Print a one-line confirmation with path
+            with _OUTPUT_LOCK:
+                print(out_path)
+    finally:
+        if session is not None:
+            session.close()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Scrape DBD Data Warehouse by juristic ID (outputs financial table JSON)")
-    parser.add_argument("juristic_id", help="13-digit juristic ID to search")
+    parser.add_argument("juristic_id", nargs="+", help="13-digit juristic ID(s) to search")
     # WAF note: default to headful; allow explicit headless opt-in (optional for dev/CI)
     mgroup = parser.add_mutually_exclusive_group()
     mgroup.add_argument("--headless", action="store_true", help="Run in headless mode (may be blocked by WAF)")
     mgroup.add_argument("--headful", action="store_true", help="Run in headful mode (default)")
     parser.add_argument("--slow", type=int, default=0, help="Slow motion in ms for debugging")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose logging to stderr")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of browsers scraping in parallel (default 1)")
+    parser.add_argument("--cache-ttl", type=float, default=24 * 3600,
+                        help="Reuse data/<ID>.json if younger than this many seconds (default 86400)")
+    parser.add_argument("--no-cache", action="store_true", help="Always scrape, ignoring existing output")
 
     args = parser.parse_args()
 
-    if not is_valid_juristic_id(args.juristic_id):
-        print("Error: juristic_id must be exactly 13 digits.", file=sys.stderr)
+    invalid = [j for j in args.juristic_id if not is_valid_juristic_id(j)]
+    if invalid:
+        print(f"Error: juristic_id must be exactly 13 digits: {', '.join(invalid)}", file=sys.stderr)
+        sys.exit(2)
+    if args.concurrency < 1:
+        print("Error: --concurrency must be at least 1.", file=sys.stderr)
         sys.exit(2)
 
-    try:
-        # Default to headful unless explicitly requested headless
-        effective_headless = True if args.headless else False
-        data = scrape(
-            juristic_id=args.juristic_id,
-            headless=effective_headless,
-            slow_mo=args.slow,
-            verbose=args.verbose,
-        )
-    except Exception as e:
-        print(json.dumps({
-            "juristic_id": args.juristic_id,
-            "error": str(e),
-        }, ensure_ascii=False, indent=2))
+    pending: "queue.Queue[str]" = queue.Queue()
+    for juristic_id in dict.fromkeys(args.juristic_id):
+        cached = None if args.no_cache else _cached_output(juristic_id, args.cache_ttl)
+        if cached:
+            # Fresh result on disk: report it without starting a browser
+            print(cached)
+        else:
+            pending.put(juristic_id)
+
+    failures: List[str] = []
+    workers = min(args.concurrency, pending.qsize())
+    if workers == 0:
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_batch_worker, pending, args, failures) for _ in range(workers)]
+        for future in futures:
+            future.result()
+
+    if failures:
         sys.exit(1)
 
-    data["juristic_id"] = args.juristic_id
-
-    # Always output the detailed financials table JSON by default
-    output_data = data.get("financials_table", {"unit": None, "years": [], "rows": []})
-    output = json.dumps(output_data, ensure_ascii=False, indent=2)
-
-    # Ensure output directory exists and write file named by juristic id
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    out_path = os.path.join(OUTPUT_DIR, f"{args.juristic_id}.json")
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(output)
-
-    # Print a one-line confirmation with path
-    print(out_path)
-
 
 if __name__ == "__main__":
     main()